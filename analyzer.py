@@ -4,34 +4,476 @@ Main analyzer class with Node.js conversion
 """
 
 import os
+import asyncio
+import codecs
+import hashlib
 import json
+import logging
+import mmap
 import re
-import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Set, Tuple, Union
 from models import MethodInfo, ModuleInfo
-from llm_providers import LLMProvider
+from llm_providers import AsyncRateLimiter, LLMCache, LLMProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import json_repair
+except ImportError:
+    json_repair = None
+
+try:
+    from blake3 import blake3 as _content_hash
+except ImportError:
+    from hashlib import blake2b as _content_hash
+
+logger = logging.getLogger(__name__)
+
+# Patterns are compiled once at import time; they run for every file and chunk
+_CLASS_START_RE = re.compile(
+    r'(?:(?:public|private|protected|static|final|abstract)\s+)*\b(?:class|interface|enum)\s+\w+[^{;]*\{'
+)
+_LITERAL_START_RE = re.compile(r'[/"\']')
+_BRACE_TOKEN_RE = re.compile(r'[{}"\'/]')
+_MEMBER_TOKEN_RE = re.compile(r'[{};("\'/]')
+_PAREN_TOKEN_RE = re.compile(r'[()"\'/]')
+_IMPORT_RE = re.compile(r'import\s+([\w\.]+);')
+_PUBLIC_METHOD_RE = re.compile(r'public\s+\w+\s+(\w+)\s*\([^)]*\)')
+_FUNC_RE = re.compile(r'(?:async\s+)?function\s+(\w+)\s*\(')
+_CODE_START_RE = re.compile(r'^[ \t]*(?:const |/\*\*|//|module\.exports)', re.M)
+_REQUIRE_LINE_RE = re.compile(r'^[ \t]*const .*require\(.*$', re.M)
+_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+_JSON_COMMA_TOKEN_RE = re.compile(r'[",]')
+
+# Trivial JavaBean entities: fields plus getters/setters that only read or assign a field
+_ENTITY_RE = re.compile(r'@Entity\b')
+_FIELD_RE = re.compile(r'private\s+[\w<>\[\],.? ]+?\s+(\w+)\s*;')
+_ACCESSOR_RE = re.compile(
+    r'((?:(?:public|protected|private|final)\s+)*[\w<>\[\],.?]+\s+(get|is|set)(\w+)\s*\([^)]*\))'
+    r'\s*\{\s*(?:return\s+(?:this\.)?\w+|(?:this\.)?\w+\s*=\s*\w+)\s*;\s*\}'
+)
+
+# Directories that never contain project sources worth analyzing
+_SKIP_DIRS = frozenset({'.git', 'target', 'build', 'node_modules'})
+
+# Only the start of a file is inspected when categorizing it
+_CATEGORIZE_HEAD_CHARS = 4000
+
+# Analysis never looks past this many chunks, so larger files are only read up to that point
+_MAX_ANALYSIS_CHUNKS = 8
+_ANALYSIS_MAX_BYTES = 3000 * 4 * _MAX_ANALYSIS_CHUNKS
+_MMAP_THRESHOLD = 1024 * 1024
+
+# File reads are I/O bound and release the GIL, so they get a wide thread pool
+_IO_WORKERS = 32
+
+# Module types picked for conversion, one of each
+_CONVERSION_TYPES = ('Controller', 'Service', 'DAO')
+
+# Files per task handed to parse worker processes; amortizes pickling round trips
+_PARSE_CHUNKSIZE = 16
+
+# (path, content, type, dependencies) - everything about a file that doesn't need the LLM
+PreparedFile = Tuple[Path, str, str, List[str]]
+
+# Bumped whenever results resolved without the LLM change, so stale fingerprints are dropped
+_FINGERPRINT_FORMAT = 2
+
+# Descriptions of chunks that did not come from the LLM
+_FALLBACK_DESCRIPTION = "Automated analysis (LLM unavailable)"
+_UNAVAILABLE_DESCRIPTION = "Analysis unavailable"
+
+# Small files are packed into shared analysis prompts up to this budget
+_BATCH_TARGET_TOKENS = 6000
+_MAX_BATCH_FILES = 8
+
+# Expected size of one file's entry in a batched reply, used against the provider's output limit;
+# a reply cut off at that limit would lose methods, so batches are also sized by what comes back
+_BATCH_FILE_OUTPUT_TOKENS = 80
+_BATCH_METHOD_OUTPUT_TOKENS = 60
+_BATCH_OUTPUT_HEADROOM = 0.75
+
+# Models sometimes echo the header's type annotation in the key: "path (Controller)"
+_BATCH_KEY_SUFFIX_RE = re.compile(r'\s*\(\w+\)\s*$')
+
+
+def _json_loads(data: str):
+    """Parse JSON with orjson when available; errors are json.JSONDecodeError either way"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _lenient_json_loads(data: str):
+    """Best-effort parse of almost-JSON LLM output; raises ValueError if it cannot be recovered"""
+    if json_repair is not None:
+        return json_repair.loads(data)
+    
+    # Drop stray text around the outermost object and trailing commas before closers
+    start, end = data.find('{'), data.rfind('}')
+    if start != -1 and end > start:
+        data = data[start:end + 1]
+    return json.loads(_strip_trailing_commas(data))
+
+
+def _strip_trailing_commas(data: str) -> str:
+    """Remove commas directly before a closing bracket, leaving string contents untouched"""
+    parts = []
+    last = 0
+    i = 0
+    while True:
+        match = _JSON_COMMA_TOKEN_RE.search(data, i)
+        if not match:
+            break
+        i = match.start()
+        if data[i] == '"':
+            i = _skip_literal(data, i)
+            continue
+        if _TRAILING_COMMA_RE.match(data, i):
+            parts.append(data[last:i])
+            last = i + 1
+        i += 1
+    parts.append(data[last:])
+    return ''.join(parts)
+
+
+def _json_dumps_bytes(data, indent: bool = False) -> bytes:
+    """Serialize JSON straight to UTF-8 bytes with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, indent=2 if indent else None).encode('utf-8')
+
+
+def _json_dumps(data, indent: bool = False) -> str:
+    """Serialize JSON with orjson when available"""
+    return _json_dumps_bytes(data, indent).decode('utf-8')
+
+
+@lru_cache(maxsize=256)
+def _read_file(file_path: str, max_bytes: Optional[int]) -> str:
+    """Read and decode a file once per process; analysis and conversion both reuse the result
+    
+    Errors propagate so that lru_cache never stores a failed read.
+    """
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        limit = size if max_bytes is None else min(size, max_bytes)
+        if size >= _MMAP_THRESHOLD:
+            # Map large files so only the bytes we need are paged in
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                data = mm[:limit]
+        else:
+            data = f.read(limit)
+    
+    if limit < size:
+        # Drop a multi-byte character cut off at the limit instead of failing
+        text = codecs.getincrementaldecoder('utf-8')().decode(data)
+    else:
+        text = data.decode('utf-8')
+    
+    # Match text-mode universal newlines
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _skip_literal(code: str, i: int) -> int:
+    """Return the index just past a comment or string/char literal starting at i, or i if none starts there"""
+    if code.startswith('//', i):
+        end = code.find('\n', i)
+        return len(code) if end == -1 else end + 1
+    if code.startswith('/*', i):
+        end = code.find('*/', i + 2)
+        return len(code) if end == -1 else end + 2
+    if code.startswith('"""', i):
+        end = code.find('"""', i + 3)
+        return len(code) if end == -1 else end + 3
+    
+    quote = code[i]
+    if quote not in '"\'':
+        return i
+    
+    j = i + 1
+    while j < len(code):
+        ch = code[j]
+        if ch == '\\':
+            j += 2
+            continue
+        if ch == quote:
+            return j + 1
+        if ch == '\n':
+            # Unterminated literal - resume scanning on the next line
+            return j
+        j += 1
+    return len(code)
+
+
+def _class_starts(code: str) -> List[re.Match]:
+    """Return the type declarations in code, ignoring any that appear in comments or string literals"""
+    matches = []
+    i = 0
+    match = _CLASS_START_RE.search(code)
+    while match:
+        literal = _LITERAL_START_RE.search(code, i, match.start())
+        if literal:
+            skipped = _skip_literal(code, literal.start())
+            i = skipped if skipped != literal.start() else literal.start() + 1
+            if match.start() < i:
+                # Inside a comment such as "class for {@link Actor}" - look past it
+                match = _CLASS_START_RE.search(code, i)
+            continue
+        matches.append(match)
+        i = match.end()
+        match = _CLASS_START_RE.search(code, i)
+    return matches
+
+
+def _find_block_end(code: str, open_idx: int) -> int:
+    """Return the index just past the brace that closes the block opened at open_idx"""
+    depth = 0
+    i = open_idx
+    while True:
+        match = _BRACE_TOKEN_RE.search(code, i)
+        if not match:
+            return len(code)
+        i = match.start()
+        ch = code[i]
+        
+        if ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        else:
+            skipped = _skip_literal(code, i)
+            if skipped != i:
+                i = skipped
+                continue
+        i += 1
+
+
+def _skip_parens(code: str, open_idx: int) -> int:
+    """Return the index just past the parenthesis that closes the one at open_idx"""
+    depth = 0
+    i = open_idx
+    while True:
+        match = _PAREN_TOKEN_RE.search(code, i)
+        if not match:
+            return len(code)
+        i = match.start()
+        ch = code[i]
+        
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        else:
+            skipped = _skip_literal(code, i)
+            if skipped != i:
+                i = skipped
+                continue
+        i += 1
+
+
+def _is_method_header(header: str) -> bool:
+    """Tell whether the text before a class member's opening brace declares a method or constructor"""
+    depth = 0
+    has_params = False
+    i = 0
+    while i < len(header):
+        ch = header[i]
+        if ch in '/"\'':
+            skipped = _skip_literal(header, i)
+            if skipped != i:
+                i = skipped
+                continue
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+            has_params = has_params or depth == 0
+        elif ch == '=' and depth == 0:
+            # Field initializer such as an anonymous class or array literal
+            return False
+        i += 1
+    return has_params
+
+
+def _method_starts(code: str) -> List[int]:
+    """Return the offset of each method declared directly in a class body, in one brace walk"""
+    return [start for start, _ in _method_spans(code)]
+
+
+def _method_spans(code: str) -> List[Tuple[int, int]]:
+    """Return (start, opening brace offset) for each method declared directly in a class body"""
+    spans = []
+    depth = 0
+    member_start = 0
+    i = 0
+    while True:
+        match = _MEMBER_TOKEN_RE.search(code, i)
+        if not match:
+            return spans
+        i = match.start()
+        ch = code[i]
+        
+        if ch == '{':
+            if depth == 1:
+                header = code[member_start:i]
+                if _is_method_header(header):
+                    # Leading Javadoc and annotations stay with their method
+                    spans.append((member_start + len(header) - len(header.lstrip()), i))
+            depth += 1
+            if depth == 1:
+                member_start = i + 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 1:
+                member_start = i + 1
+        elif ch == ';':
+            if depth == 1:
+                member_start = i + 1
+        elif ch == '(':
+            if depth <= 1:
+                # Parameter lists and annotation arguments such as @GetMapping({"/a", "/b"})
+                # may hold braces that do not open a type or member body
+                i = _skip_parens(code, i)
+                continue
+        else:
+            skipped = _skip_literal(code, i)
+            if skipped != i:
+                i = skipped
+                continue
+        i += 1
+
+
+def _read_bounded(file_path, max_bytes: Optional[int] = None) -> str:
+    """Read a file through the shared cache; a bound that covers the whole file is a full read"""
+    path = os.path.abspath(file_path)
+    if max_bytes is not None:
+        try:
+            if os.path.getsize(path) <= max_bytes:
+                max_bytes = None
+        except OSError:
+            pass
+    try:
+        return _read_file(path, max_bytes)
+    except Exception as e:
+        print(f"Error reading {path}: {e}")
+        return ""
+
+
+def _categorize(file_name: str, content: str) -> str:
+    """Categorize a Java file from its stem and the head of its content"""
+    # Annotations live near the top; a bounded head keeps the substring checks cheap
+    content = content[:_CATEGORIZE_HEAD_CHARS]
+    
+    if "Controller" in file_name or "@Controller" in content or "@RestController" in content:
+        return "Controller"
+    elif "Service" in file_name or "@Service" in content:
+        return "Service"
+    elif "Repository" in file_name or "DAO" in file_name or "@Repository" in content:
+        return "DAO"
+    elif "Entity" in file_name or "@Entity" in content:
+        return "Model"
+    elif "Config" in file_name or "@Configuration" in content:
+        return "Configuration"
+    elif "Application" in file_name:
+        return "Application"
+    else:
+        return "Utility"
+
+
+def _extract_dependencies(code: str) -> List[str]:
+    """Extract project imports from Java source"""
+    imports = _IMPORT_RE.findall(code)
+    dependencies = [imp for imp in imports if 'sakilaproject' in imp.lower()]
+    return list(set(dependencies))
+
+
+def _parse_single_file(file_path: Path) -> PreparedFile:
+    """Read a Java file and extract everything that doesn't need the LLM; top-level so worker processes can run it"""
+    content = _read_bounded(file_path, _ANALYSIS_MAX_BYTES)
+    return file_path, content, _categorize(file_path.stem, content), _extract_dependencies(content)
+
+
+def _select_names(names_by_type: Dict[str, List[str]]) -> Dict[str, str]:
+    """Pick the first Controller and the Service and DAO whose names match it"""
+    selected = {}
+
+    #Match the controller, service and DAO names
+    # Step 1: Select the first Controller
+    controller_candidates = names_by_type.get('Controller')
+    if controller_candidates:
+        selected['Controller'] = controller_candidates[0]
+        # Strip suffix like 'Controller' to get base name
+        base_name = controller_candidates[0].replace('Controller', '')
+    else:
+        base_name = None
+
+    # Step 2: Match Service and DAO using base name
+    for module_type in ['Service', 'DAO']:
+        candidates = names_by_type.get(module_type)
+        if candidates:
+            if base_name:
+                # Match if name starts with base_name (e.g. ActorService)
+                match = next((name for name in candidates if name.startswith(base_name)), None)
+                selected[module_type] = match if match else candidates[0]
+            else:
+                selected[module_type] = candidates[0]
+
+    return selected
 
 
 class JavaCodebaseAnalyzer:
     """Analyzes Java codebase and converts to Node.js"""
     
-    def __init__(self, repo_path: str, provider: LLMProvider):
+    def __init__(self, repo_path: Union[str, Path], provider: LLMProvider,
+                 max_concurrency: int = 8, requests_per_minute: Optional[int] = None,
+                 cache_dir: Optional[str] = ".llm_cache"):
         self.repo_path = Path(repo_path)
         self.provider = provider
+        self.max_concurrency = max_concurrency
+        self.limiter = AsyncRateLimiter(requests_per_minute or provider.rpm, 60)
+        # Responses are near-deterministic at low temperature, so cache them across runs
+        self.cache = LLMCache(cache_dir) if cache_dir else None
+        self._llm_string = f"{provider.get_provider_name()}:{provider.get_model_name()}"
         self.modules: List[ModuleInfo] = []
         self.project_overview = ""
+        self._type_counts: Counter = Counter()
+        self._by_type: Dict[str, List[ModuleInfo]] = defaultdict(list)
+        # Incremental analysis: previous results by relative path, and this run's content hashes
+        self.fingerprint_path = os.path.join(cache_dir, "fingerprints.json") if cache_dir else None
+        self._fingerprints: Dict[str, dict] = {}
+        self._file_hashes: Dict[str, str] = {}
+        self._incomplete: Set[str] = set()
         print(f"Using LLM provider: {provider.get_provider_name()}")
     
-    def clone_repository(self, github_url: str):
-        """Clone the GitHub repository locally"""
+    def clone_repository(self, github_url: str, shallow: bool = False):
+        """Clone the GitHub repository locally; shallow fetches only the tip of the default branch"""
         import subprocess
+        command = ["git", "clone"]
+        if shallow:
+            # Analysis needs the working tree only, never the history
+            command += ["--depth=1", "--single-branch"]
         try:
             subprocess.run(
-                ["git", "clone", github_url, str(self.repo_path)],
+                command + [github_url, str(self.repo_path)],
                 check=True,
                 capture_output=True
             )
+            # Cached reads may refer to files from a previous checkout
+            _read_file.cache_clear()
             print(f"Repository cloned to {self.repo_path}")
         except subprocess.CalledProcessError as e:
             print(f"Failed to clone repository: {e}")
@@ -40,53 +482,45 @@ class JavaCodebaseAnalyzer:
     def find_java_files(self) -> List[Path]:
         """Recursively find all Java files in the codebase"""
         java_files = []
-        for path in self.repo_path.rglob("*.java"):
-            if "test" not in str(path).lower():
-                java_files.append(path)
+        # scandir entries carry cached file types, so no per-entry stat is needed.
+        # Test code is pruned by name as we go: a directory whose name mentions
+        # "test" is never entered, so only the short file name is checked below it.
+        stack = [str(self.repo_path)]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in _SKIP_DIRS and "test" not in name.lower():
+                            stack.append(entry.path)
+                    elif name.endswith('.java') and "test" not in name.lower():
+                        java_files.append(Path(entry.path))
         return java_files
     
-    def categorize_file(self, file_path: Path) -> str:
+    def categorize_file(self, file_path: Path, content_head: Optional[str] = None) -> str:
         """Categorize Java file based on naming conventions and content"""
-        file_name = file_path.stem
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = ''.join([next(f, '') for _ in range(50)])
-        except:
-            content = ""
-        
-        if "Controller" in file_name or "@Controller" in content or "@RestController" in content:
-            return "Controller"
-        elif "Service" in file_name or "@Service" in content:
-            return "Service"
-        elif "Repository" in file_name or "DAO" in file_name or "@Repository" in content:
-            return "DAO"
-        elif "Entity" in file_name or "@Entity" in content:
-            return "Model"
-        elif "Config" in file_name or "@Configuration" in content:
-            return "Configuration"
-        elif "Application" in file_name:
-            return "Application"
-        else:
-            return "Utility"
+        if content_head is None:
+            content_head = self.read_file_content(file_path)
+        return _categorize(file_path.stem, content_head)
     
-    def read_file_content(self, file_path: Path) -> str:
-        """Read and return file content"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except Exception as e:
-            print(f"Error reading {file_path}: {e}")
-            return ""
+    def read_file_content(self, file_path: Path, max_bytes: Optional[int] = None) -> str:
+        """Read and return file content, optionally only the first max_bytes"""
+        return _read_bounded(file_path, max_bytes)
     
     def chunk_code(self, code: str, max_tokens: int = 3000) -> List[str]:
         """Smart chunking that respects code structure"""
         max_chars = max_tokens * 4
         chunks = []
         
-        # Split by class boundaries
-        class_pattern = r'((?:public|private|protected)?\s*(?:static)?\s*class\s+\w+[^{]*\{(?:[^{}]*\{[^{}]*\})*[^{}]*\})'
-        classes = re.findall(class_pattern, code, re.DOTALL)
+        # Split by class boundaries, walking braces to find where each top-level type ends
+        classes = []
+        last_end = 0
+        for match in _class_starts(code):
+            if match.start() < last_end:
+                continue  # Nested type, already part of the enclosing block
+            end = _find_block_end(code, match.end() - 1)
+            classes.append(code[match.start():end])
+            last_end = end
         
         if classes:
             for cls in classes:
@@ -105,29 +539,25 @@ class JavaCodebaseAnalyzer:
         """Split large class by method boundaries"""
         chunks = []
         
-        class_header_match = re.match(r'(.*?)((?:public|private|protected)\s+\w+\s+\w+\s*\([^)]*\))', code, re.DOTALL)
-        class_header = class_header_match.group(1) if class_header_match else ""
-        
-        method_pattern = r'((?:public|private|protected)\s+(?:static\s+)?[\w<>\[\]]+\s+\w+\s*\([^)]*\)\s*(?:throws\s+[\w,\s]+)?\s*\{)'
-        method_starts = [(m.start(), m.group(0)) for m in re.finditer(method_pattern, code)]
+        method_starts = _method_starts(code)
         
         if not method_starts:
             for i in range(0, len(code), max_chars):
                 chunks.append(code[i:i + max_chars])
             return chunks
         
-        methods = []
-        for i, (start, signature) in enumerate(method_starts):
-            end = method_starts[i + 1][0] if i + 1 < len(method_starts) else len(code)
-            method_body = code[start:end]
-            methods.append((signature, method_body))
+        # Everything before the first method (declaration, fields) is repeated in every chunk
+        class_header = code[:method_starts[0]]
+        bounds = method_starts + [len(code)]
+        methods = [code[bounds[i]:bounds[i + 1]] for i in range(len(method_starts))]
         
         current_chunk = class_header
-        for signature, method_body in methods:
+        for method_body in methods:
             if len(current_chunk) + len(method_body) <= max_chars:
                 current_chunk += method_body
             else:
-                if current_chunk.strip():
+                # A header with no methods yet is not worth a chunk of its own
+                if current_chunk.strip() and current_chunk != class_header:
                     chunks.append(current_chunk)
                 current_chunk = class_header + method_body
         
@@ -138,23 +568,49 @@ class JavaCodebaseAnalyzer:
     
     def extract_dependencies(self, code: str) -> List[str]:
         """Extract import statements to identify dependencies"""
-        imports = re.findall(r'import\s+([\w\.]+);', code)
-        dependencies = [imp for imp in imports if 'sakilaproject' in imp.lower()]
-        return list(set(dependencies))
+        return _extract_dependencies(code)
     
     def call_llm(self, prompt: str) -> str:
         """Call the configured LLM provider"""
+        if self.cache:
+            cached = self.cache.lookup(prompt, self._llm_string)
+            if cached is not None:
+                return cached
+        
         try:
-            return self.provider.analyze_code(prompt)
+            response = self.provider.analyze_code(prompt)
         except Exception as e:
             print(f"LLM call failed: {e}")
             return self._fallback_analysis(prompt)
+        
+        if self.cache:
+            self.cache.update(prompt, self._llm_string, response)
+        return response
+    
+    async def acall_llm(self, prompt: str) -> str:
+        """Call the configured LLM provider, respecting the rate limit"""
+        # Cache hits never reach the provider, so they don't consume rate budget
+        if self.cache:
+            cached = self.cache.lookup(prompt, self._llm_string)
+            if cached is not None:
+                return cached
+        
+        async with self.limiter:
+            try:
+                response = await self.provider.aanalyze_code(prompt)
+            except Exception as e:
+                print(f"LLM call failed: {e}")
+                return self._fallback_analysis(prompt)
+        
+        if self.cache:
+            self.cache.update(prompt, self._llm_string, response)
+        return response
     
     def _fallback_analysis(self, code_context: str) -> str:
         """Simple regex-based analysis when LLM fails"""
-        methods = re.findall(r'public\s+\w+\s+(\w+)\s*\([^)]*\)', code_context)
-        return json.dumps({
-            "description": "Automated analysis (LLM unavailable)",
+        methods = _PUBLIC_METHOD_RE.findall(code_context)
+        return _json_dumps({
+            "description": _FALLBACK_DESCRIPTION,
             "methods": [
                 {
                     "name": m,
@@ -165,21 +621,247 @@ class JavaCodebaseAnalyzer:
             ]
         })
     
+    def _prep_file(self, file_path: Path) -> PreparedFile:
+        """Read a Java file and extract everything that doesn't need the LLM"""
+        return _parse_single_file(file_path)
+    
+    def parse_files_parallel(self, paths: List[Path], max_workers: Optional[int] = None,
+                             processes: bool = False) -> List[PreparedFile]:
+        """Run the structural parse of many files ahead of any LLM call
+        
+        The parse is mostly reads, so it runs on threads by default, which also keeps the read
+        cache in this process for conversion; processes=True spreads it over worker processes.
+        """
+        if processes:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(_parse_single_file, paths, chunksize=_PARSE_CHUNKSIZE))
+        with ThreadPoolExecutor(max_workers=max_workers or _IO_WORKERS) as executor:
+            return list(executor.map(self._prep_file, paths))
+    
     def analyze_file(self, file_path: Path) -> ModuleInfo:
         """Analyze a single Java file and extract metadata"""
-        content = self.read_file_content(file_path)
-        file_type = self.categorize_file(file_path)
-        dependencies = self.extract_dependencies(content)
+        return self._analyze_prepped(self._prep_file(file_path))
+    
+    def _analyze_prepped(self, prepped: PreparedFile) -> ModuleInfo:
+        """Analyze an already-read Java file"""
+        resolved = self._resolve_without_llm(prepped)
+        if resolved:
+            return resolved
         
+        file_path, content, file_type, dependencies = prepped
         chunks = self.chunk_code(content, max_tokens=3000)
-        all_methods = []
-        description = ""
+        responses = []
         
         for chunk_idx, chunk in enumerate(chunks):
             if len(chunks) > 1:
                 print(f"    Processing chunk {chunk_idx + 1}/{len(chunks)}...")
             
-            prompt = f"""Analyze this Java {file_type} class and provide structured information.
+            prompt = self._create_analysis_prompt(file_type, chunk, chunk_idx, len(chunks))
+            responses.append(self.call_llm(prompt))
+        
+        analyses = [self._parse_analysis_response(r) for r in responses]
+        return self._build_module_info(file_path, file_type, dependencies, analyses)
+    
+    async def analyze_file_async(self, file_path: Path) -> ModuleInfo:
+        """Analyze a single Java file, sending all of its chunks concurrently"""
+        return await self._analyze_prepped_async(self._prep_file(file_path))
+    
+    async def _analyze_prepped_async(self, prepped: PreparedFile) -> ModuleInfo:
+        """Analyze an already-read Java file, sending all of its chunks concurrently"""
+        resolved = self._resolve_without_llm(prepped)
+        if resolved:
+            return resolved
+        return await self._analyze_unresolved_async(prepped)
+    
+    async def _analyze_unresolved_async(self, prepped: PreparedFile) -> ModuleInfo:
+        """Send every chunk of a file that neither the fingerprints nor the templates resolved"""
+        file_path, content, file_type, dependencies = prepped
+        chunks = self.chunk_code(content, max_tokens=3000)
+        if len(chunks) > 1:
+            print(f"    {file_path.name}: processing {len(chunks)} chunks...")
+        
+        responses = await asyncio.gather(*(
+            self.acall_llm(self._create_analysis_prompt(file_type, chunk, chunk_idx, len(chunks)))
+            for chunk_idx, chunk in enumerate(chunks)
+        ))
+        
+        analyses = [self._parse_analysis_response(r) for r in responses]
+        return self._build_module_info(file_path, file_type, dependencies, analyses)
+    
+    async def _analyze_batch_async(self, batch: List[PreparedFile]) -> Dict[Path, ModuleInfo]:
+        """Analyze one packed batch of files, falling back to single-file analysis"""
+        modules: Dict[Path, ModuleInfo] = {}
+        pending = self._split_resolved(batch, modules)
+        
+        for group in self._split_by_output(pending):
+            if len(group) > 1:
+                response = await self.acall_llm(self._create_batch_prompt(group))
+                modules.update(self._build_batch_modules(group, response))
+        
+        # Large files, and any file missing from a batch response, go through the single-file path
+        for prepped in pending:
+            if prepped[0] not in modules:
+                modules[prepped[0]] = await self._analyze_unresolved_async(prepped)
+        
+        return modules
+    
+    def _split_by_output(self, pending: List[PreparedFile]) -> List[List[PreparedFile]]:
+        """Group files so each batched reply is expected to fit the provider's output limit"""
+        limit = self.provider.max_output_tokens
+        if limit is None:
+            return [pending]
+        
+        budget = limit * _BATCH_OUTPUT_HEADROOM
+        groups: List[List[PreparedFile]] = []
+        current: List[PreparedFile] = []
+        current_tokens = 0
+        for prepped in pending:
+            tokens = _BATCH_FILE_OUTPUT_TOKENS + _BATCH_METHOD_OUTPUT_TOKENS * len(_method_starts(prepped[1]))
+            if current and current_tokens + tokens > budget:
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(prepped)
+            current_tokens += tokens
+        
+        if current:
+            groups.append(current)
+        return groups
+    
+    def _split_resolved(self, batch: List[PreparedFile], modules: Dict[Path, ModuleInfo]) -> List[PreparedFile]:
+        """Record results that need no LLM call in modules and return the files that do"""
+        pending = []
+        for prepped in batch:
+            resolved = self._resolve_without_llm(prepped)
+            if resolved:
+                modules[prepped[0]] = resolved
+            else:
+                pending.append(prepped)
+        return pending
+    
+    def _resolve_without_llm(self, prepped: PreparedFile) -> Optional[ModuleInfo]:
+        """Reuse the previous run's result for an unchanged file, or build one for a trivial file"""
+        file_path, content = prepped[0], prepped[1]
+        relative_path = str(file_path.relative_to(self.repo_path))
+        digest = _content_hash(content.encode('utf-8')).hexdigest()
+        self._file_hashes[relative_path] = digest
+        
+        cached = self._fingerprints.get(relative_path)
+        if cached and cached["hash"] == digest:
+            return ModuleInfo.from_dict(cached["module"])
+        
+        return self._trivial_module_info(prepped)
+    
+    def _fingerprint_version(self) -> str:
+        """Identify the prompts, model and resolver format; a change invalidates every stored fingerprint"""
+        templates = self._create_analysis_prompt("", "", 0, 1) + self._create_batch_prompt([])
+        return hashlib.sha256(
+            f"{_FINGERPRINT_FORMAT}:{self._llm_string}:{templates}".encode('utf-8')
+        ).hexdigest()
+    
+    def _load_fingerprints(self):
+        """Load previous per-file results if they were produced by the same prompts and model"""
+        self._fingerprints = {}
+        if not self.fingerprint_path or not os.path.exists(self.fingerprint_path):
+            return
+        
+        try:
+            with open(self.fingerprint_path, 'rb') as f:
+                data = _json_loads(f.read())
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable fingerprint cache: {e}")
+            return
+        
+        if data.get("version") == self._fingerprint_version():
+            self._fingerprints = data.get("files", {})
+    
+    def _save_fingerprints(self):
+        """Store this run's per-file results keyed by content hash"""
+        if not self.fingerprint_path:
+            return
+        
+        files = {
+            m.file_path: {"hash": self._file_hashes[m.file_path], "module": m.to_dict()}
+            for m in self.modules
+            if m.file_path in self._file_hashes and m.file_path not in self._incomplete
+        }
+        os.makedirs(os.path.dirname(self.fingerprint_path), exist_ok=True)
+        with open(self.fingerprint_path, 'wb') as f:
+            f.write(_json_dumps_bytes({"version": self._fingerprint_version(), "files": files}))
+    
+    def _trivial_accessors(self, content: str) -> Optional[List[re.Match]]:
+        """Return the accessor matches of an @Entity whose methods are all plain getters/setters, else None"""
+        if '@Entity' not in content or not _ENTITY_RE.search(content):
+            return None
+        # A nested type's methods are invisible to the class-body walk, so never call it trivial
+        if len(_class_starts(content)) != 1:
+            return None
+        
+        # Match each method to the accessor that opens at the same brace; counts alone can pair
+        # a getter in a comment with a real method, so every method must be an accessor itself
+        accessors = {}
+        for match in _ACCESSOR_RE.finditer(content):
+            accessors[content.find('{', match.end(1))] = match
+        
+        spans = _method_spans(content)
+        if not all(brace in accessors for _, brace in spans):
+            return None
+        return [accessors[brace] for _, brace in spans]
+    
+    def _trivial_module_info(self, prepped: PreparedFile) -> Optional[ModuleInfo]:
+        """Build a ModuleInfo from a template for trivial entities, skipping the LLM"""
+        file_path, content, file_type, dependencies = prepped
+        accessors = self._trivial_accessors(content)
+        if accessors is None:
+            return None
+        
+        fields = _FIELD_RE.findall(content)
+        methods = []
+        for match in accessors:
+            signature, prefix, field = match.groups()
+            field = field[:1].lower() + field[1:]
+            methods.append(MethodInfo(
+                name=prefix + match.group(3),
+                signature=' '.join(signature.split()),
+                description=f"{'Sets' if prefix == 'set' else 'Returns'} the {field} field",
+                complexity="Low"
+            ))
+        
+        return ModuleInfo(
+            name=file_path.stem,
+            type=file_type,
+            description=f"JPA entity {file_path.stem} with fields: {', '.join(fields) or 'none'}",
+            file_path=str(file_path.relative_to(self.repo_path)),
+            methods=methods,
+            dependencies=dependencies
+        )
+    
+    def _pack_files(self, files: List[Path], target_tokens: int) -> List[List[Path]]:
+        """Greedily pack consecutive small files into batches under the prompt budget"""
+        max_chars = target_tokens * 4
+        batches = []
+        current: List[Path] = []
+        current_size = 0
+        
+        for file_path in files:
+            size = os.path.getsize(file_path)
+            if size > max_chars:
+                batches.append([file_path])
+                continue
+            
+            if current and (current_size + size > max_chars or len(current) >= _MAX_BATCH_FILES):
+                batches.append(current)
+                current, current_size = [], 0
+            current.append(file_path)
+            current_size += size
+        
+        if current:
+            batches.append(current)
+        
+        return batches
+    
+    def _create_analysis_prompt(self, file_type: str, chunk: str, chunk_idx: int, total_chunks: int) -> str:
+        """Create the structured-analysis prompt for one chunk of a Java file"""
+        return f"""Analyze this Java {file_type} class and provide structured information.
 Return ONLY valid JSON with this exact structure (no markdown, no explanation):
 {{
   "description": "Brief description of the class purpose",
@@ -193,86 +875,221 @@ Return ONLY valid JSON with this exact structure (no markdown, no explanation):
   ]
 }}
 
-Java code (chunk {chunk_idx + 1} of {len(chunks)}):
+Java code (chunk {chunk_idx + 1} of {total_chunks}):
 {chunk}
 """
-            
-            response = self.call_llm(prompt)
-            
+    
+    def _create_batch_prompt(self, prepped: List[PreparedFile]) -> str:
+        """Create one structured-analysis prompt covering several small Java files"""
+        files = "\n".join(
+            f"<<FILE {file_path.relative_to(self.repo_path)}>>\n// {file_type}\n{content}"
+            for file_path, content, file_type, _ in prepped
+        )
+        
+        return f"""Analyze each Java file below and provide structured information.
+Return ONLY a valid JSON object keyed by the file path shown in each <<FILE ...>> header,
+with this exact structure (no markdown, no explanation):
+{{
+  "path/to/File.java": {{
+    "description": "Brief description of the class purpose",
+    "methods": [
+      {{
+        "name": "methodName",
+        "signature": "public ReturnType methodName(params)",
+        "description": "What the method does",
+        "complexity": "Low|Medium|High"
+      }}
+    ]
+  }}
+}}
+
+Files:
+{files}
+"""
+    
+    def _parse_analysis_response(self, response: str) -> Optional[dict]:
+        """Parse an LLM analysis response, returning None if it is not a JSON object"""
+        response = response.replace("```json", "").replace("```", "").strip()
+        try:
+            analysis = _json_loads(response)
+        except json.JSONDecodeError:
+            # Recover what we can rather than losing the chunk's methods
             try:
-                response = response.replace("```json", "").replace("```", "").strip()
-                analysis = json.loads(response)
-                
-                if chunk_idx == 0 and analysis.get("description"):
-                    description = analysis.get("description", "")
-                
-                for method in analysis.get("methods", []):
-                    all_methods.append(MethodInfo(
-                        name=method.get("name", "unknown"),
-                        signature=method.get("signature", ""),
-                        description=method.get("description", ""),
-                        complexity=method.get("complexity", "Medium")
-                    ))
-            except json.JSONDecodeError:
+                analysis = _lenient_json_loads(response)
+            except ValueError:
+                return None
+            logger.debug("Repaired malformed JSON response: %.200s", response)
+        return analysis if isinstance(analysis, dict) else None
+    
+    def _build_batch_modules(self, prepped: List[PreparedFile],
+                             response: str) -> Dict[Path, ModuleInfo]:
+        """Distribute a batched analysis response to per-file ModuleInfo objects"""
+        # No lenient parsing here: a reply truncated at the output limit would be "repaired"
+        # into shortened method lists, so anything but valid JSON sends the files on their own
+        try:
+            analysis = _json_loads(response.replace("```json", "").replace("```", "").strip())
+        except json.JSONDecodeError:
+            logger.debug("Batched response is not valid JSON: %.200s", response)
+            return {}
+        if not isinstance(analysis, dict):
+            return {}
+        analysis = {
+            _BATCH_KEY_SUFFIX_RE.sub('', key): value for key, value in analysis.items()
+        }
+        
+        modules = {}
+        for file_path, _, file_type, dependencies in prepped:
+            entry = (
+                analysis.get(str(file_path.relative_to(self.repo_path))) or
+                analysis.get(file_path.name) or
+                analysis.get(file_path.stem)
+            )
+            if isinstance(entry, dict):
+                modules[file_path] = self._build_module_info(file_path, file_type, dependencies, [entry])
+        
+        return modules
+    
+    def _build_module_info(self, file_path: Path, file_type: str, dependencies: List[str],
+                           analyses: List[Optional[dict]]) -> ModuleInfo:
+        """Combine per-chunk analyses into a ModuleInfo"""
+        relative_path = str(file_path.relative_to(self.repo_path))
+        all_methods = []
+        description = ""
+        
+        for chunk_idx, analysis in enumerate(analyses):
+            # Any chunk that failed, fell back to regex or came back malformed keeps the
+            # whole module out of the fingerprint store, so it is analyzed again next run
+            if analysis is None or analysis.get("description") == _FALLBACK_DESCRIPTION:
+                self._incomplete.add(relative_path)
+            if analysis is None:
                 if chunk_idx == 0:
-                    description = "Analysis unavailable"
+                    description = _UNAVAILABLE_DESCRIPTION
+                continue
+            
+            if chunk_idx == 0 and isinstance(analysis.get("description"), str):
+                description = analysis["description"]
+            
+            # Repaired replies can carry any shape; keep only well-formed method objects
+            methods = analysis.get("methods")
+            if not isinstance(methods, list):
+                self._incomplete.add(relative_path)
+                continue
+            for method in methods:
+                if not isinstance(method, dict):
+                    self._incomplete.add(relative_path)
+                    continue
+                all_methods.append(MethodInfo(
+                    name=method.get("name", "unknown"),
+                    signature=method.get("signature", ""),
+                    description=method.get("description", ""),
+                    complexity=method.get("complexity", "Medium")
+                ))
         
         return ModuleInfo(
             name=file_path.stem,
             type=file_type,
             description=description,
-            file_path=str(file_path.relative_to(self.repo_path)),
+            file_path=relative_path,
             methods=all_methods,
             dependencies=dependencies
         )
     
     def analyze_codebase(self):
         """Analyze entire codebase"""
-        print("Scanning Java files...")
-        java_files = self.find_java_files()
-        print(f"Found {len(java_files)} Java files")
+        asyncio.run(self.aanalyze_codebase())
+    
+    async def aanalyze_codebase(self, prepared: Optional[List[PreparedFile]] = None,
+                                queue: Optional[asyncio.Queue] = None):
+        """Analyze entire codebase, fanning LLM calls out across concurrent workers
+        
+        prepared takes the output of parse_files_parallel; otherwise files are found and read here.
+        When a queue is given, every ModuleInfo is put on it as soon as its batch completes.
+        """
+        if prepared is None:
+            print("Scanning Java files...")
+            java_files = self.find_java_files()
+            print(f"Found {len(java_files)} Java files")
+        else:
+            java_files = [p[0] for p in prepared]
+            print(f"Analyzing {len(java_files)} parsed Java files")
+        parsed = {p[0]: p for p in prepared or ()}
+        self._incomplete = set()
+        self._load_fingerprints()
         
         print("\n Analyzing files...")
-        for i, file_path in enumerate(java_files, 1):
-            print(f"  [{i}/{len(java_files)}] {file_path.name}")
-            time.sleep(2)  # To avoid rate limits
-            module = self.analyze_file(file_path)
-            self.modules.append(module)
+        # The semaphore bounds in-flight batches; the rate limiter spaces requests
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        positions = {file_path: i for i, file_path in enumerate(java_files, 1)}
+        loop = asyncio.get_running_loop()
+        
+        with ThreadPoolExecutor(max_workers=_IO_WORKERS) as executor:
+            # Reads start immediately and overlap with LLM calls for batches that are already prepared
+            prep_futures = {
+                file_path: loop.run_in_executor(executor, self._prep_file, file_path)
+                for file_path in java_files
+                if file_path not in parsed
+            }
+            
+            async def analyze(batch: List[Path]) -> Dict[Path, ModuleInfo]:
+                prepped = [parsed.get(file_path) or await prep_futures[file_path] for file_path in batch]
+                async with semaphore:
+                    for file_path in batch:
+                        print(f"  [{positions[file_path]}/{len(java_files)}] {file_path.name}")
+                    result = await self._analyze_batch_async(prepped)
+                if queue is not None:
+                    for module in result.values():
+                        await queue.put(module)
+                return result
+            
+            results = await asyncio.gather(*(
+                analyze(batch) for batch in self._pack_files(java_files, _BATCH_TARGET_TOKENS)
+            ))
+        
+        modules: Dict[Path, ModuleInfo] = {}
+        for result in results:
+            modules.update(result)
+        self.modules.extend(modules[file_path] for file_path in java_files)
+        self._index_modules()
+        self._save_fingerprints()
         
-        self._generate_project_overview()
+        self.project_overview = (await self.acall_llm(self._create_overview_prompt())).strip()
+    
+    def _index_modules(self):
+        """Group and count modules by type in a single pass over self.modules"""
+        self._by_type = defaultdict(list)
+        for m in self.modules:
+            self._by_type[m.type].append(m)
+        self._type_counts = Counter({t: len(ms) for t, ms in self._by_type.items()})
     
-    def _generate_project_overview(self):
-        """Generate high-level project overview"""
-        prompt = f"""Based on this Java project structure, provide a concise overview (2-3 sentences):
+    def _create_overview_prompt(self) -> str:
+        """Create the high-level project overview prompt"""
+        return f"""Based on this Java project structure, provide a concise overview (2-3 sentences):
 
 Project has {len(self.modules)} modules:
-- {sum(1 for m in self.modules if m.type == 'Controller')} Controllers
-- {sum(1 for m in self.modules if m.type == 'Service')} Services
-- {sum(1 for m in self.modules if m.type == 'DAO')} DAOs
-- {sum(1 for m in self.modules if m.type == 'Model')} Models
+- {self._type_counts['Controller']} Controllers
+- {self._type_counts['Service']} Services
+- {self._type_counts['DAO']} DAOs
+- {self._type_counts['Model']} Models
 
 Module names: {', '.join([m.name for m in self.modules[:10]])}
 """
-        
-        response = self.call_llm(prompt)
-        self.project_overview = response.strip()
     
     def export_knowledge(self, output_path: str = "codebase_analysis.json"):
         """Export structured knowledge to JSON"""
-        data = {
-            "projectOverview": self.project_overview,
-            "modules": [m.to_dict() for m in self.modules],
-            "statistics": {
-                "totalModules": len(self.modules),
-                "byType": {
-                    module_type: sum(1 for m in self.modules if m.type == module_type)
-                    for module_type in set(m.type for m in self.modules)
-                }
-            }
+        statistics = {
+            "totalModules": len(self.modules),
+            "byType": dict(self._type_counts)
         }
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        # Stream one module at a time so the whole document never exists as Python objects.
+        # Nested values are re-indented to match a single indented dump of the document.
+        with open(output_path, 'wb') as f:
+            f.write(b'{\n  "projectOverview": ' + _json_dumps_bytes(self.project_overview) + b',\n  "modules": [')
+            for i, m in enumerate(self.modules):
+                f.write(b',\n    ' if i else b'\n    ')
+                f.write(_json_dumps_bytes(m.to_dict(), indent=True).replace(b'\n', b'\n    '))
+            f.write(b'\n  ]' if self.modules else b']')
+            f.write(b',\n  "statistics": ' + _json_dumps_bytes(statistics, indent=True).replace(b'\n', b'\n  ') + b'\n}')
         
         print(f"\n✓ Knowledge exported to {output_path}")
     
@@ -288,58 +1105,72 @@ Module names: {', '.join([m.name for m in self.modules[:10]])}
         
         # return selected
         
-        time.sleep(2)
+        chosen = _select_names({t: [m.name for m in self._by_type[t]] for t in _CONVERSION_TYPES})
+        return {
+            module_type: next(m for m in self._by_type[module_type] if m.name == name)
+            for module_type, name in chosen.items()
+        }
+    
+    def select_prepared_for_conversion(self, prepared: List[PreparedFile]) -> Dict[str, str]:
+        """Make the same choice as select_files_for_conversion from parsed files, before any LLM call
+        
+        Returns the chosen files' relative paths mapped to their module type.
+        """
+        names: Dict[str, List[str]] = defaultdict(list)
+        for file_path, _, file_type, _ in prepared:
+            names[file_type].append(file_path.stem)
+        chosen = _select_names(names)
+        
         selected = {}
-
-        #Match the controller, service and DAO names
-        # Step 1: Select the first Controller
-        controller_candidates = [m for m in self.modules if m.type == 'Controller']
-        if controller_candidates:
-            selected['Controller'] = controller_candidates[0]
-            controller_name = controller_candidates[0].name
-            # Strip suffix like 'Controller' to get base name
-            base_name = controller_name.replace('Controller', '')
-        else:
-            base_name = None
-
-        # Step 2: Match Service and DAO using base name
-        for module_type in ['Service', 'DAO']:
-            candidates = [m for m in self.modules if m.type == module_type]
-            time.sleep(2)
-            if candidates:
-                if base_name:
-                    # Match if name starts with base_name (e.g. ActorService)
-                    match = next((m for m in candidates if m.name.startswith(base_name)), None)
-                    selected[module_type] = match if match else candidates[0]
-                else:
-                    selected[module_type] = candidates[0]
-
+        for file_path, _, file_type, _ in prepared:
+            if chosen.get(file_type) == file_path.stem:
+                selected[str(file_path.relative_to(self.repo_path))] = file_type
+                del chosen[file_type]
         return selected
     
     def convert_to_nodejs(self, java_module: ModuleInfo, output_dir: str = "converted"):
         """Convert Java class to Node.js equivalent - IMPROVED VERSION"""
+        prompts = self._create_conversion_prompts(java_module)
+        
+        nodejs_code_parts = []
+        for chunk_idx, conversion_prompt in enumerate(prompts):
+            if len(prompts) > 1:
+                print(f"    Converting chunk {chunk_idx + 1}/{len(prompts)}...")
+            nodejs_code_parts.append(self.call_llm(conversion_prompt))
+        
+        return self._finish_conversion(java_module, nodejs_code_parts, output_dir)
+    
+    async def aconvert_to_nodejs(self, java_module: ModuleInfo, output_dir: str = "converted"):
+        """Convert Java class to Node.js equivalent, sending all chunks concurrently"""
+        prompts = self._create_conversion_prompts(java_module)
+        if len(prompts) > 1:
+            print(f"    {java_module.name}: converting {len(prompts)} chunks...")
+        
+        responses = await asyncio.gather(*(self.acall_llm(prompt) for prompt in prompts))
+        return self._finish_conversion(java_module, responses, output_dir)
+    
+    def _create_conversion_prompts(self, java_module: ModuleInfo) -> List[str]:
+        """Chunk a Java class and build one conversion prompt per chunk"""
         java_code = self.read_file_content(self.repo_path / java_module.file_path)
         
         # Determine appropriate chunk size based on module type
         chunk_size = 2000 if java_module.type == "Controller" else 2500
         chunks = self.chunk_code(java_code, max_tokens=chunk_size)
-        nodejs_code_parts = []
         print(f"    before foreach loop chunk_size: {chunk_size}")
         print(f"    before foreach loop chunks length: {len(chunks)}")
-
-        for chunk_idx, chunk in enumerate(chunks):
-            if len(chunks) > 1:
-                print(f"    Converting chunk {chunk_idx + 1}/{len(chunks)}...")
-            
-            # IMPROVED CONVERSION PROMPT
-            conversion_prompt = self._create_conversion_prompt(java_module, chunk, chunk_idx, len(chunks))
-            
-            nodejs_code = self.call_llm(conversion_prompt)
-            nodejs_code = self._clean_llm_response(nodejs_code)
-            nodejs_code_parts.append(nodejs_code)
+        
+        # IMPROVED CONVERSION PROMPT
+        return [
+            self._create_conversion_prompt(java_module, chunk, chunk_idx, len(chunks))
+            for chunk_idx, chunk in enumerate(chunks)
+        ]
+    
+    def _finish_conversion(self, java_module: ModuleInfo, responses: List[str], output_dir: str) -> str:
+        """Clean, merge and save the converted chunks of one Java class"""
+        nodejs_code_parts = [self._clean_llm_response(response) for response in responses]
         
         # Combine chunks if multiple
-        if len(chunks) > 1:
+        if len(nodejs_code_parts) > 1:
             final_code = self._merge_converted_chunks(nodejs_code_parts, java_module.type)
         else:
             final_code = nodejs_code_parts[0]
@@ -425,43 +1256,29 @@ Generate clean, compilable Node.js code for THIS {module.type} ONLY. No other fi
         # Remove markdown code fences
         response = response.replace("```javascript", "").replace("```js", "").replace("```", "")
         
-        # Remove any explanatory text before the code
-        lines = response.split('\n')
-        code_started = False
-        cleaned_lines = []
-        
-        for line in lines:
-            # Detect start of actual code
-            if not code_started and (
-                line.strip().startswith('const ') or
-                line.strip().startswith('/**') or
-                line.strip().startswith('//') or
-                line.strip().startswith('module.exports')
-            ):
-                code_started = True
-            
-            if code_started:
-                cleaned_lines.append(line)
+        # Remove any explanatory text before the first line that looks like code
+        code_start = _CODE_START_RE.search(response)
+        if code_start:
+            response = response[code_start.start():]
         
-        return '\n'.join(cleaned_lines).strip()
+        return response.strip()
     
     def _cleanup_converted_code(self, code: str, module: ModuleInfo) -> str:
         """Clean up and validate the converted code"""
         
-        # Remove any duplicate require statements
-        lines = code.split('\n')
+        # Remove any duplicate require statements, keeping the first occurrence in place
         seen_requires = set()
-        cleaned_lines = []
-        
-        for line in lines:
-            if line.strip().startswith('const ') and 'require(' in line:
-                if line not in seen_requires:
-                    seen_requires.add(line)
-                    cleaned_lines.append(line)
+        parts = []
+        last = 0
+        for match in _REQUIRE_LINE_RE.finditer(code):
+            line = match.group(0)
+            if line in seen_requires:
+                parts.append(code[last:match.start()])
+                last = match.end() + 1  # Drop the line's newline as well
             else:
-                cleaned_lines.append(line)
-        
-        code = '\n'.join(cleaned_lines)
+                seen_requires.add(line)
+        parts.append(code[last:])
+        code = ''.join(parts)
         
         # Ensure proper module.exports
         if 'module.exports' not in code:
@@ -489,8 +1306,7 @@ Generate clean, compilable Node.js code for THIS {module.type} ONLY. No other fi
                 return code + '\n\nmodule.exports = router;\n'
         
         # Extract function names for Service/DAO
-        func_pattern = r'(?:async\s+)?function\s+(\w+)\s*\('
-        functions = re.findall(func_pattern, code)
+        functions = _FUNC_RE.findall(code)
         
         if functions:
             exports = ',\n    '.join(functions)
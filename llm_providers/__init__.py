@@ -3,11 +3,23 @@ LLM Providers Package
 Factory for creating LLM provider instances
 """
 
+import hashlib
 import os
-from typing import Optional
+from collections import OrderedDict
+from typing import Optional, Tuple
+import requests
 from .base import LLMProvider
 from .gemini import GeminiProvider
 from .ollama import OllamaProvider
+from .rate_limiter import AsyncRateLimiter
+from .cache import LLMCache
+
+# Shared session for provider status probes
+_session = requests.Session()
+
+# Providers built so far, most recently used last
+_PROVIDER_CACHE_SIZE = 8
+_providers: "OrderedDict[tuple, LLMProvider]" = OrderedDict()
 
 
 def create_provider(provider_name: str, api_key: Optional[str] = None) -> LLMProvider:
@@ -23,12 +35,37 @@ def create_provider(provider_name: str, api_key: Optional[str] = None) -> LLMPro
         
     Raises:
         ValueError: If provider is unknown or API key is missing
+    
+    Instances are memoized per provider, key digest and (for Ollama) model
+    and host, so repeated calls reuse the same client and its open connections.
     """
     provider_name = provider_name.lower()
+    settings: Tuple[str, ...] = ()
+    if provider_name == "gemini":
+        api_key = api_key or os.getenv("GEMINI_API_KEY")
+    elif provider_name == "ollama":
+        settings = (
+            os.getenv("OLLAMA_MODEL", "llama3"),
+            os.getenv("OLLAMA_HOST", "http://localhost:11434"),
+        )
     
+    # Only a digest of the key is kept as the cache key
+    cache_key = (provider_name, hashlib.sha256((api_key or "").encode("utf-8")).hexdigest(), settings)
+    provider = _providers.get(cache_key)
+    if provider is None:
+        # Failures raise here and are not cached
+        provider = _build_provider(provider_name, api_key, settings)
+        _providers[cache_key] = provider
+        if len(_providers) > _PROVIDER_CACHE_SIZE:
+            _providers.popitem(last=False)
+    else:
+        _providers.move_to_end(cache_key)
+    return provider
+
+
+def _build_provider(provider_name: str, api_key: Optional[str], settings: Tuple[str, ...]) -> LLMProvider:
+    """Construct a new provider instance"""
     if provider_name == "gemini":
-        if not api_key:
-            api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             raise ValueError(
                 "Gemini API key required. "
@@ -36,8 +73,7 @@ def create_provider(provider_name: str, api_key: Optional[str] = None) -> LLMPro
         return GeminiProvider(api_key)
     
     elif provider_name == "ollama":
-        model = os.getenv("OLLAMA_MODEL", "llama3")
-        host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+        model, host = settings
         provider = OllamaProvider(model, host)
         
         # Check if model exists
@@ -86,8 +122,7 @@ def list_available_providers() -> dict:
         else:
             # For Ollama, check if it's running
             try:
-                import requests
-                response = requests.get("http://localhost:11434/api/tags", timeout=1)
+                response = _session.get("http://localhost:11434/api/tags", timeout=1)
                 info["configured"] = response.status_code == 200
             except:
                 info["configured"] = False
@@ -99,6 +134,8 @@ __all__ = [
     'LLMProvider',
     'GeminiProvider',
     'OllamaProvider',
+    'AsyncRateLimiter',
+    'LLMCache',
     'create_provider',
     'list_available_providers'
 ]
\ No newline at end of file
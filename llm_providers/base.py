@@ -3,6 +3,7 @@ Base LLM Provider
 Abstract base class for all LLM providers
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Optional
 
@@ -10,6 +11,12 @@ from typing import Optional
 class LLMProvider(ABC):
     """Base class for LLM providers"""
     
+    # Requests per minute the provider accepts; used to configure the rate limiter
+    rpm: int = 60
+    
+    # Longest response the provider will generate, in tokens; None if unbounded
+    max_output_tokens: Optional[int] = None
+    
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key
     
@@ -26,6 +33,43 @@ class LLMProvider(ABC):
         """
         raise NotImplementedError("Subclasses must implement analyze_code()")
     
+    async def aanalyze_code(self, prompt: str) -> str:
+        """
+        Asynchronously analyze code using the LLM
+        
+        Providers without a native async client run analyze_code()
+        in a worker thread so the event loop is not blocked.
+        
+        Args:
+            prompt: The prompt to send to the LLM
+            
+        Returns:
+            str: The LLM response
+        """
+        return await asyncio.to_thread(self.analyze_code, prompt)
+    
+    def ping(self):
+        """
+        Send a minimal request to check that the provider is reachable and authorized
+        
+        Raises:
+            Exception: If the provider cannot serve requests
+        """
+        self.analyze_code("ok")
+    
     def get_provider_name(self) -> str:
         """Get the name of the provider"""
         return self.__class__.__name__.replace("Provider", "")
+    
+    def get_model_name(self) -> str:
+        """Get the name of the model used by the provider"""
+        return getattr(self, "model", "")
+    
+    def close(self):
+        """Release any resources held by the provider"""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
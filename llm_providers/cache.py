@@ -0,0 +1,97 @@
+"""
+LLM Response Cache
+Persistent prompt/response cache backed by SQLite
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+
+class LLMCache:
+    """SQLite-backed response cache with an in-memory LRU layer on top"""
+    
+    def __init__(self, cache_dir: str = ".llm_cache", memory_size: int = 512):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(cache_dir, "responses.sqlite3"),
+            check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL)"
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def make_key(prompt: str, llm_string: str) -> str:
+        """Hash the provider/model identifier and prompt into a cache key"""
+        return hashlib.sha256(f"{llm_string}:{prompt}".encode("utf-8")).hexdigest()
+    
+    def lookup(self, prompt: str, llm_string: str) -> Optional[str]:
+        """
+        Look up a cached response
+        
+        Args:
+            prompt: The prompt sent to the LLM
+            llm_string: Identifier of the provider and model
+            
+        Returns:
+            Optional[str]: The cached response, or None on a miss
+        """
+        key = self.make_key(prompt, llm_string)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+            
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            self._remember(key, row[0])
+            return row[0]
+    
+    def update(self, prompt: str, llm_string: str, response: str):
+        """
+        Store a response in the cache
+        
+        Args:
+            prompt: The prompt sent to the LLM
+            llm_string: Identifier of the provider and model
+            response: The LLM response to store
+        """
+        key = self.make_key(prompt, llm_string)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)",
+                (key, response)
+            )
+            self._conn.commit()
+            self._remember(key, response)
+    
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+    
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+    
+    def _remember(self, key: str, response: str):
+        """Insert into the in-memory LRU, evicting the oldest entry when full"""
+        self._memory[key] = response
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
@@ -9,13 +9,18 @@ from .base import LLMProvider
 class GeminiProvider(LLMProvider):
     """Google Gemini API (Used FREE tier)"""
     
+    # Free-tier limit for gemini-2.0-flash
+    rpm = 15
+    max_output_tokens = 2048
+    
     def __init__(self, api_key: str, model: str = "gemini-2.0-flash"):
         super().__init__(api_key)
+        self.model = model
         self.llm = ChatGoogleGenerativeAI(
             model=model,
             api_key=api_key,
             temperature=0.1,
-            max_output_tokens=2048,
+            max_output_tokens=self.max_output_tokens,
         )
     
     def analyze_code(self, prompt: str) -> str:
@@ -33,13 +38,37 @@ class GeminiProvider(LLMProvider):
         """
         try:
             resp = self.llm.invoke(prompt)
-            content = getattr(resp, "content", resp)
-            if isinstance(content, str):
-                return content
-            # Handle multi-part content (some Gemini responses)
-            return "".join(
-                part.get("text", "") if isinstance(part, dict) else str(part)
-                for part in content
-            )
+            return self._extract_text(resp)
+        except Exception as e:
+            raise Exception(f"Gemini (LangChain) error: {e}")
+    
+    async def aanalyze_code(self, prompt: str) -> str:
+        """
+        Analyze code using Google Gemini API without blocking the event loop
+        
+        Args:
+            prompt: Code analysis prompt
+            
+        Returns:
+            str: Analysis result from Gemini
+            
+        Raises:
+            Exception: If API call fails
+        """
+        try:
+            resp = await self.llm.ainvoke(prompt)
+            return self._extract_text(resp)
         except Exception as e:
             raise Exception(f"Gemini (LangChain) error: {e}")
+    
+    @staticmethod
+    def _extract_text(resp) -> str:
+        """Extract plain text from a LangChain chat response"""
+        content = getattr(resp, "content", resp)
+        if isinstance(content, str):
+            return content
+        # Handle multi-part content (some Gemini responses)
+        return "".join(
+            part.get("text", "") if isinstance(part, dict) else str(part)
+            for part in content
+        )
@@ -3,18 +3,44 @@ Ollama Local Provider
 FREE - local LLM
 """
 
+import threading
+from typing import Iterator, List
 import requests
 from .base import LLMProvider
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 
 class OllamaProvider(LLMProvider):
     """Ollama (To Use Local LLM)"""
     
+    # Local server, effectively unlimited
+    rpm = 10_000
+    
     def __init__(self, model: str = "llama3", host: str = "http://localhost:11434"):
         super().__init__(None)  # No API key needed
         self.api_url = f"{host}/api/generate"
         self.model = model
         self.host = host
+        # requests.Session is not thread-safe and aanalyze_code runs on worker threads,
+        # so each thread keeps its own keep-alive session
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._sessions_lock = threading.Lock()
+    
+    @property
+    def session(self) -> requests.Session:
+        """The calling thread's HTTP session, created on first use"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
     
     def analyze_code(self, prompt: str) -> str:
         """
@@ -26,21 +52,63 @@ class OllamaProvider(LLMProvider):
         Returns:
             str: Analysis result from Ollama
             
+        Raises:
+            Exception: If Ollama is not running or API call fails
+        """
+        return "".join(self.analyze_code_stream(prompt))
+    
+    def analyze_code_stream(self, prompt: str) -> Iterator[str]:
+        """
+        Stream the analysis from local Ollama instance as it is generated
+        
+        Args:
+            prompt: Code analysis prompt
+            
+        Yields:
+            str: Response fragments in generation order
+            
         Raises:
             Exception: If Ollama is not running or API call fails
         """
         data = {
             "model": self.model,
             "prompt": prompt,
-            "stream": False,
+            "stream": True,
             "format": "json"
         }
+        return self._generate(data)
+    
+    def ping(self):
+        """
+        Generate a single token to check that Ollama is running and has the model
         
+        Raises:
+            Exception: If Ollama is not running or API call fails
+        """
+        data = {
+            "model": self.model,
+            "prompt": "ok",
+            "stream": True,
+            "options": {"num_predict": 1}
+        }
+        for _ in self._generate(data):
+            pass
+    
+    def _generate(self, data: dict) -> Iterator[str]:
+        """Post a streaming generate request and yield its response fragments"""
         try:
-            response = requests.post(self.api_url, json=data, timeout=120)
-            response.raise_for_status()
-            result = response.json()
-            return result["response"]
+            with self.session.post(self.api_url, json=data, stream=True, timeout=120) as response:
+                response.raise_for_status()
+                # Ollama streams one JSON object per line until "done" is set
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = _json_loads(line)
+                    if "error" in chunk:
+                        raise Exception(f"Ollama API error: {chunk['error']}")
+                    yield chunk["response"]
+                    if chunk.get("done"):
+                        break
         except requests.exceptions.ConnectionError:
             raise Exception(
                 f"Cannot connect to Ollama at {self.host}. "
@@ -52,15 +120,23 @@ class OllamaProvider(LLMProvider):
             )
         except requests.exceptions.RequestException as e:
             raise Exception(f"Ollama API error: {e}")
-        except (KeyError, IndexError) as e:
+        except (KeyError, IndexError, ValueError) as e:
             raise Exception(f"Ollama returned unexpected format: {e}")
     
     def check_model_exists(self) -> bool:
         """Check if the model is downloaded"""
         try:
-            response = requests.get(f"{self.host}/api/tags", timeout=5)
+            response = self.session.get(f"{self.host}/api/tags", timeout=5)
             response.raise_for_status()
             models = response.json().get("models", [])
             return any(m["name"].startswith(self.model) for m in models)
         except:
             return False
+    
+    def close(self):
+        """Close every thread's HTTP session"""
+        with self._sessions_lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
+        self._local = threading.local()
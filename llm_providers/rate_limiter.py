@@ -0,0 +1,46 @@
+"""
+Rate Limiter
+Async token-bucket limiter for spacing LLM requests
+"""
+
+import asyncio
+import time
+
+
+class AsyncRateLimiter:
+    """Allow at most `max_rate` acquisitions per `time_period` seconds"""
+    
+    def __init__(self, max_rate: float, time_period: float = 60):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._rate_per_sec = max_rate / time_period
+        self._level = 0.0
+        self._last_check = time.monotonic()
+    
+    def _leak(self):
+        """Drain the bucket according to the time elapsed since the last check"""
+        now = time.monotonic()
+        elapsed = now - self._last_check
+        self._level = max(self._level - elapsed * self._rate_per_sec, 0.0)
+        self._last_check = now
+    
+    async def acquire(self):
+        """Wait until there is capacity for one more request"""
+        while True:
+            self._leak()
+            if self._level + 1 <= self.max_rate:
+                self._level += 1
+                return
+            await asyncio.sleep((self._level + 1 - self.max_rate) / self._rate_per_sec)
+    
+    def record(self):
+        """Count a request that was sent without acquire(), such as a startup probe"""
+        self._leak()
+        self._level += 1
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return None
@@ -3,89 +3,124 @@ Main Entry Point
 Runs the Java to Node.js analyzer with modular LLM providers
 """
 
+import asyncio
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
 from analyzer import JavaCodebaseAnalyzer
+from models import AnalyzerConfig
 from llm_providers import create_provider, list_available_providers
 
+_SEP = "=" * 60
+
+# Provider badges, indexed by "is configured" / "is free"
+_STATUS = ("✗ Not configured", "✓ Configured")
+_COST = ("💳 Paid", "FREE")
+
+# Modules converted at the same time; the analyzer's rate limiter still spaces the requests
+MAX_CONVERSION_CONCURRENCY = 4
+
+# Provider ids accepted from LLM_PROVIDER
+_VALID_PROVIDERS = frozenset({"gemini", "openai", "anthropic", "ollama"})
+
+# Environment variable holding each provider's API key (None: no key needed)
+PROVIDER_ENV = {
+    "gemini": "GEMINI_API_KEY",
+    "openai": "OPENAI_API_KEY",
+    "anthropic": "ANTHROPIC_API_KEY",
+    "ollama": None,
+}
+
 
 def print_banner():
     """Print application banner"""
-    print("=" * 60)
-    print("Java to Node.js Codebase Analyzer (Modular)")
-    print("=" * 60)
+    sys.stdout.write(f"{_SEP}\nJava to Node.js Codebase Analyzer (Modular)\n{_SEP}\n")
 
 
-def print_available_providers():
+def print_available_providers(providers: Optional[dict] = None):
     """Display available LLM providers"""
-    providers = list_available_providers()
+    if providers is None:
+        providers = list_available_providers()
     
     print("\nAvailable LLM Providers:")
     print("-" * 60)
     
     for provider_id, info in providers.items():
-        status = "✓ Configured" if info["configured"] else "✗ Not configured"
-        cost_badge = "FREE" if info["cost"] == "FREE" else "💳 Paid"
+        configured = info["configured"]
+        lines = [
+            f"\n{provider_id.upper():12} - {info['name']}",
+            f"  Cost:      {_COST[info['cost'] == 'FREE']}",
+            f"  Status:    {_STATUS[configured]}",
+        ]
         
-        print(f"\n{provider_id.upper():12} - {info['name']}")
-        print(f"  Cost:      {cost_badge}")
-        print(f"  Status:    {status}")
+        if info["key_required"] and not configured:
+            lines.append(f"  Setup:     export {info['env_var']}='your-key'")
+            lines.append(f"  Get key:   {info['url']}")
+        elif not configured and provider_id == "ollama":
+            lines.append("  Setup:     ollama serve")
+            lines.append(f"  Install:   {info['url']}")
         
-        if info["key_required"] and not info["configured"]:
-            print(f"  Setup:     export {info['env_var']}='your-key'")
-            print(f"  Get key:   {info['url']}")
-        elif not info["configured"] and provider_id == "ollama":
-            print(f"  Setup:     ollama serve")
-            print(f"  Install:   {info['url']}")
+        print("\n".join(lines))
 
 
-def get_provider_choice() -> str:
+def get_provider_choice(providers: Optional[dict] = None) -> str:
     """Get provider choice from environment or user"""
     # Check environment variable
     provider = os.getenv("LLM_PROVIDER", "").lower()
     
-    if provider in ["gemini", "openai", "anthropic", "ollama"]:
+    if provider in _VALID_PROVIDERS:
         return provider
     
     # Check which providers are configured
-    providers = list_available_providers()
-    configured = [p for p, info in providers.items() if info["configured"]]
+    if providers is None:
+        providers = list_available_providers()
+    # One pass collects the configured providers and notes the preferred one
+    preferred = None
+    configured = []
+    for provider_id, info in providers.items():
+        if info["configured"]:
+            configured.append(provider_id)
+            if provider_id == "gemini":
+                preferred = provider_id
     
     if configured:
         print(f"\n Found configured provider(s): {', '.join(configured)}")
-        if "gemini" in configured:
-            return "gemini"
-        return configured[0]
+        return preferred or configured[0]
     
 
     
     return None
 
 
-def main():
-    """Main execution function"""
+async def amain():
+    """Main execution flow, driving LLM calls concurrently"""
     print_banner()
-    print_available_providers()
+    # Probing providers may hit the network (Ollama), so do it once
+    providers = list_available_providers()
+    print_available_providers(providers)
     
     # Configuration
-    GITHUB_URL = "https://github.com/janjakovacevic/SakilaProject.git"
-    REPO_PATH = "./SakilaProject"
+    config = AnalyzerConfig(
+        repo_path=Path("./SakilaProject"),
+        github_url="https://github.com/janjakovacevic/SakilaProject.git",
+        shallow=True,
+    )
+    # Stat the checkout once; nothing else needs to ask again
+    repo_exists = config.repo_path.exists()
     
     # Get provider choice
-    provider_name = get_provider_choice()
+    provider_name = get_provider_choice(providers)
     
     if not provider_name:
         sys.exit(1)
     
-    # Try different API keys
-    api_key = (
-        os.getenv("GEMINI_API_KEY") or
-        os.getenv("OPENAI_API_KEY") or
-        os.getenv("ANTHROPIC_API_KEY")
-    )
+    # Only pass the key that belongs to the chosen provider
+    api_key = os.environ.get(PROVIDER_ENV.get(provider_name) or "")
     
     # Initialize provider
-    print("\n" + "=" * 60)
+    sys.stdout.write("\n" + _SEP + "\n")
     try:
         provider = create_provider(provider_name, api_key)
     except ValueError as e:
@@ -93,52 +128,98 @@ def main():
         sys.exit(1)
     
     # Initialize analyzer
-    analyzer = JavaCodebaseAnalyzer(REPO_PATH, provider)
-    
-    # Clone repository if needed
-    if not os.path.exists(REPO_PATH):
-        print(f"\n Cloning repository...")
+    analyzer = JavaCodebaseAnalyzer(config.repo_path, provider)
+    
+    # The clone and the provider check are independent I/O, so they run side by side;
+    # the clone is left to finish on a failed check so no partial checkout is left behind
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        ping_future = executor.submit(provider.ping)
+        clone_future = None
+        if not repo_exists:
+            print(f"\n Cloning repository...")
+            clone_future = executor.submit(analyzer.clone_repository, config.github_url, shallow=config.shallow)
+        
         try:
-            analyzer.clone_repository(GITHUB_URL)
+            ping_future.result()
         except Exception as e:
-            print(f" Failed to clone: {e}")
+            print(f"\n✗ Provider check failed: {e}")
             sys.exit(1)
+        
+        # The probe used one request of the provider's budget; the analysis burst must not reuse it
+        analyzer.limiter.record()
+        
+        if clone_future:
+            try:
+                clone_future.result()
+            except Exception as e:
+                print(f" Failed to clone: {e}")
+                sys.exit(1)
+    
+    # Analyze codebase, converting the selected modules as soon as each one is analyzed
+    sys.stdout.write("\n" + _SEP + "\n")
+    try:
+        # Parse every file up front; selection below needs all names and types
+        prepared = analyzer.parse_files_parallel(analyzer.find_java_files())
+    except Exception as e:
+        print(f"\n Analysis failed: {e}")
+        sys.exit(1)
     
-    # Analyze codebase
-    print("\n" + "=" * 60)
+    # Selection only needs file names and types, so it is known before any LLM call
+    selected = analyzer.select_prepared_for_conversion(prepared)
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    async def convert_worker():
+        while True:
+            module = await queue.get()
+            try:
+                module_type = selected.get(module.file_path)
+                if module_type:
+                    print(f"\n  Converting {module_type}: {module.name}")
+                    try:
+                        await analyzer.aconvert_to_nodejs(module)
+                    except Exception as e:
+                        print(f"  ✗ Conversion failed: {e}")
+            finally:
+                queue.task_done()
+    
+    workers = [asyncio.create_task(convert_worker()) for _ in range(MAX_CONVERSION_CONCURRENCY)]
     try:
-        analyzer.analyze_codebase()
+        await analyzer.aanalyze_codebase(prepared, queue)
     except Exception as e:
         print(f"\n Analysis failed: {e}")
         sys.exit(1)
     
+    # Let in-flight conversions finish, then stop the idle workers
+    await queue.join()
+    for worker in workers:
+        worker.cancel()
+    
     # Export knowledge
-    print("\n" + "=" * 60)
+    sys.stdout.write("\n" + _SEP + "\n")
     analyzer.export_knowledge()
     
-    # Convert selected files
-    print("\n" + "=" * 60)
-    print(" Converting to Node.js...")
-    selected = analyzer.select_files_for_conversion()
-    
-    for module_type, module in selected.items():
-        print(f"\n  Converting {module_type}: {module.name}")
-        try:
-            analyzer.convert_to_nodejs(module)
-        except Exception as e:
-            print(f"  ✗ Conversion failed: {e}")
-    
-    print("\n" + "=" * 60)
-    print(" Analysis and conversion complete!")
-    print("=" * 60)
-    print("\n Output files:")
-    print("  - codebase_analysis.json  (Structured analysis)")
-    print("  - converted/*.js          (Node.js files)")
-    print("\n Next steps:")
-    print("  1. Review: cat codebase_analysis.json | jq")
-    print("  2. Setup:  cd converted && npm install")
-    print("  3. Run:    npm start")
-    print("")
+    report = "\n".join([
+        "",
+        _SEP,
+        " Analysis and conversion complete!",
+        _SEP,
+        "",
+        " Output files:",
+        "  - codebase_analysis.json  (Structured analysis)",
+        "  - converted/*.js          (Node.js files)",
+        "",
+        " Next steps:",
+        "  1. Review: cat codebase_analysis.json | jq",
+        "  2. Setup:  cd converted && npm install",
+        "  3. Run:    npm start",
+        "",
+    ])
+    sys.stdout.write(report + "\n")
+
+
+def main():
+    """Main execution function"""
+    asyncio.run(amain())
 
 
 if __name__ == "__main__":
@@ -3,22 +3,35 @@ Data Models
 Dataclasses for storing analysis results
 """
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+from operator import attrgetter
+from pathlib import Path
 from typing import List
 
 
+# Both models declare __slots__ by hand (dataclass(slots=True) needs Python 3.10):
+# no per-instance __dict__, which adds up over thousands of methods
 @dataclass
 class MethodInfo:
     """Information about a method"""
+    __slots__ = ('name', 'signature', 'description', 'complexity')
+    
     name: str
     signature: str
     description: str
     complexity: str
 
 
+# Serialized MethodInfo fields; read in one attrgetter call instead of asdict() reflection
+_METHOD_FIELDS = MethodInfo.__slots__
+_get_method_fields = attrgetter(*_METHOD_FIELDS)
+
+
 @dataclass
 class ModuleInfo:
     """Information about a Java module/class"""
+    __slots__ = ('name', 'type', 'description', 'file_path', 'methods', 'dependencies')
+    
     name: str
     type: str  # Controller, Service, DAO, Model, etc.
     description: str
@@ -33,6 +46,28 @@ class ModuleInfo:
             'type': self.type,
             'description': self.description,
             'file_path': self.file_path,
-            'methods': [asdict(m) for m in self.methods],
+            'methods': [dict(zip(_METHOD_FIELDS, _get_method_fields(m))) for m in self.methods],
             'dependencies': self.dependencies
         }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "ModuleInfo":
+        """Rebuild a ModuleInfo from the output of to_dict()"""
+        return cls(
+            name=data['name'],
+            type=data['type'],
+            description=data['description'],
+            file_path=data['file_path'],
+            methods=[MethodInfo(**m) for m in data['methods']],
+            dependencies=list(data['dependencies'])
+        )
+
+
+@dataclass
+class AnalyzerConfig:
+    """Where the analyzed repository lives and how to fetch it"""
+    __slots__ = ('repo_path', 'github_url', 'shallow')
+    
+    repo_path: Path
+    github_url: str
+    shallow: bool
@@ -0,0 +1,20 @@
+"""
+Shared Test Fixtures
+"""
+
+import pytest
+
+from analyzer import JavaCodebaseAnalyzer
+from llm_providers.base import LLMProvider
+
+
+class OfflineProvider(LLMProvider):
+    """Provider that must never be reached by structural tests"""
+    
+    def analyze_code(self, prompt: str) -> str:
+        raise AssertionError("unexpected LLM call")
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    return JavaCodebaseAnalyzer(tmp_path, OfflineProvider(), cache_dir=None)
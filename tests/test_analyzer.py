@@ -0,0 +1,203 @@
+"""
+Analyzer Tests
+Structural parsing helpers that run without an LLM
+"""
+
+import json
+
+import analyzer as analyzer_module
+from analyzer import JavaCodebaseAnalyzer, _class_starts, _method_starts
+from llm_providers.base import LLMProvider
+
+
+ANNOTATED_CONTROLLER = '''@RestController
+@RequestMapping({"/films"})
+public class FilmController {
+    private final FilmService filmService;
+
+    @RequestMapping(value = {"/a", "/b"}, method = RequestMethod.GET)
+    public List<Film> all() {
+        return filmService.all();
+    }
+
+    @GetMapping({"/x", "/y"})
+    public Film one() {
+        return filmService.one();
+    }
+
+    @SuppressWarnings({"unchecked"})
+    public List<Film> raw() {
+        return (List<Film>) filmService.raw();
+    }
+
+    public int count() {
+        return filmService.count();
+    }
+}
+'''
+
+
+def test_method_starts_with_array_annotation_arguments():
+    starts = _method_starts(ANNOTATED_CONTROLLER)
+    headers = [ANNOTATED_CONTROLLER[s:].split('\n', 1)[0] for s in starts]
+    assert headers == [
+        '@RequestMapping(value = {"/a", "/b"}, method = RequestMethod.GET)',
+        '@GetMapping({"/x", "/y"})',
+        '@SuppressWarnings({"unchecked"})',
+        'public int count() {',
+    ]
+
+
+def test_class_starts_ignore_comments_and_strings():
+    code = '''/**
+ * REST controller class for {@link Actor}
+ */
+@RestController
+public class ActorController {
+    // inner class Foo { is only a comment
+    private static final String NAME = "class Bar {";
+
+    static class Page {
+    }
+}
+'''
+    assert [m.group().split()[-2] for m in _class_starts(code)] == ['ActorController', 'Page']
+
+
+ENTITY_HEAD = '''@Entity
+@Table(name = "actor")
+public class Actor {
+    private int actorId;
+
+    public int getActorId() {
+        return actorId;
+    }
+
+    public void setActorId(int actorId) {
+        this.actorId = actorId;
+    }
+'''
+
+
+def _trivial_names(analyzer, code):
+    accessors = analyzer._trivial_accessors(code)
+    return None if accessors is None else [m.group(2) + m.group(3) for m in accessors]
+
+
+def test_trivial_entity_has_only_accessors(analyzer):
+    assert _trivial_names(analyzer, ENTITY_HEAD + '}\n') == ['getActorId', 'setActorId']
+
+
+def test_trivial_entity_rejects_real_method_beside_nested_getter(analyzer):
+    code = ENTITY_HEAD.replace('''    public void setActorId(int actorId) {
+        this.actorId = actorId;
+    }
+''', '''    @Override
+    public boolean equals(Object o) {
+        return o instanceof Actor && ((Actor) o).actorId == actorId;
+    }
+
+    static class Key {
+        private int id;
+
+        public int getId() {
+            return id;
+        }
+    }
+''') + '}\n'
+    assert _trivial_names(analyzer, code) is None
+
+
+def test_trivial_entity_rejects_annotated_query_method(analyzer):
+    code = ENTITY_HEAD + '''
+    @SuppressWarnings({"unchecked"})
+    public List<Film> films(EntityManager em) {
+        return em.createQuery("from Film f where f.actor = :a").setParameter("a", this).getResultList();
+    }
+}
+'''
+    assert _trivial_names(analyzer, code) is None
+
+
+def _prepped(analyzer, name, file_type, methods):
+    body = ''.join(f'    public int m{i}() {{\n        return {i};\n    }}\n' for i in range(methods))
+    return (analyzer.repo_path / f'{name}.java', f'public class {name} {{\n{body}}}\n', file_type, [])
+
+
+def test_batches_are_split_by_expected_output(analyzer):
+    analyzer.provider.max_output_tokens = 2048
+    pending = [_prepped(analyzer, f'Service{i}', 'Service', 9) for i in range(8)]
+    groups = analyzer._split_by_output(pending)
+    assert sum(len(g) for g in groups) == 8
+    assert all(len(g) == 2 for g in groups)
+
+
+def test_batch_reply_keys_may_echo_the_file_type(analyzer):
+    pending = [_prepped(analyzer, 'ActorService', 'Service', 1), _prepped(analyzer, 'ActorDAO', 'DAO', 1)]
+    response = (
+        '{"ActorService.java (Service)": {"description": "s", "methods": []},'
+        ' "ActorDAO.java": {"description": "d", "methods": []}}'
+    )
+    modules = analyzer._build_batch_modules(pending, response)
+    assert sorted(m.description for m in modules.values()) == ['d', 's']
+
+
+def test_truncated_batch_reply_is_a_miss(analyzer):
+    pending = [_prepped(analyzer, 'ActorService', 'Service', 1), _prepped(analyzer, 'ActorDAO', 'DAO', 1)]
+    response = '{"ActorService.java": {"description": "s", "methods": [{"name": "m0", "signa'
+    assert analyzer._build_batch_modules(pending, response) == {}
+
+
+def test_lenient_parse_keeps_commas_inside_strings(monkeypatch):
+    monkeypatch.setattr(analyzer_module, 'json_repair', None)
+    reply = 'Here: {"description": "uses ,} and ,] tokens", "methods": [],}'
+    assert analyzer_module._lenient_json_loads(reply) == {
+        'description': 'uses ,} and ,] tokens',
+        'methods': [],
+    }
+
+
+def test_repaired_reply_with_string_methods_builds_a_module(analyzer):
+    file_path = analyzer.repo_path / 'Actor.java'
+    analysis = analyzer._parse_analysis_response('{"description": "d", "methods": ["getA",],}')
+    module = analyzer._build_module_info(file_path, 'Model', [], [analysis])
+    assert module.description == 'd'
+    assert module.methods == []
+
+
+class ScriptedProvider(LLMProvider):
+    """Answers every analysis prompt except those mentioning a marker, which fail"""
+    
+    rpm = 10_000
+    
+    def __init__(self, fail_marker):
+        super().__init__(None)
+        self.fail_marker = fail_marker
+    
+    def analyze_code(self, prompt):
+        if self.fail_marker in prompt:
+            raise RuntimeError("quota exceeded")
+        return '{"description": "d", "methods": [{"name": "m", "signature": "s", "description": "d", "complexity": "Low"}]}'
+
+
+def test_module_with_a_failed_chunk_is_not_fingerprinted(tmp_path):
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    padding = '        int x = 0;\n' * 20
+    body = ''.join(f'    public int m{i}() {{\n{padding}        return {i};\n    }}\n' for i in range(40))
+    (repo / 'BigService.java').write_text(f'public class BigService {{\n{body}    public int failHere() {{\n{padding}        return 0;\n    }}\n}}\n')
+    (repo / 'SmallService.java').write_text('public class SmallService {\n    public int one() {\n        return 1;\n    }\n}\n')
+    
+    analyzer = JavaCodebaseAnalyzer(repo, ScriptedProvider('failHere'), cache_dir=str(tmp_path / 'cache'))
+    analyzer.analyze_codebase()
+    assert len(analyzer.chunk_code(analyzer.read_file_content(repo / 'BigService.java'))) > 1
+    
+    stored = json.loads((tmp_path / 'cache' / 'fingerprints.json').read_text())['files']
+    assert list(stored) == ['SmallService.java']
+
+
+def test_failed_read_is_not_cached(analyzer):
+    file_path = analyzer.repo_path / 'Late.java'
+    assert analyzer.read_file_content(file_path) == ''
+    file_path.write_text('public class Late {}\n')
+    assert analyzer.read_file_content(file_path) == 'public class Late {}\n'